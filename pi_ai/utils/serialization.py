@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import re
 from dataclasses import asdict, is_dataclass
+from functools import lru_cache
 from typing import Any, Dict
 
 from pydantic import BaseModel
@@ -15,8 +16,11 @@ _STOP_REASON_TO_CAMEL = {"tool_use": "toolUse"}
 _STOP_REASON_TO_SNAKE = {"toolUse": "tool_use"}
 _CONTENT_TYPE_TO_CAMEL = {"tool_call": "toolCall"}
 _CONTENT_TYPE_TO_SNAKE = {"toolCall": "tool_call"}
+_CAMEL_WORD_RE = re.compile(r"(.)([A-Z][a-z]+)")
+_CAMEL_BOUNDARY_RE = re.compile(r"([a-z0-9])([A-Z])")
 
 
+@lru_cache(maxsize=1024)
 def to_camel_key(key: str) -> str:
     if "_" not in key:
         return key
@@ -26,11 +30,12 @@ def to_camel_key(key: str) -> str:
     return parts[0] + "".join(part[:1].upper() + part[1:] for part in parts[1:])
 
 
+@lru_cache(maxsize=1024)
 def to_snake_key(key: str) -> str:
     if "_" in key:
         return key
-    s1 = re.sub(r"(.)([A-Z][a-z]+)", r"\1_\2", key)
-    s2 = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", s1)
+    s1 = _CAMEL_WORD_RE.sub(r"\1_\2", key)
+    s2 = _CAMEL_BOUNDARY_RE.sub(r"\1_\2", s1)
     return s2.lower()
 
 
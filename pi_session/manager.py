@@ -4,29 +4,71 @@ from __future__ import annotations
 
 import json
 import os
-from dataclasses import dataclass
+import secrets
+import sys
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Callable, Dict, Iterable, List, Optional
+from typing import Annotated, Any, Callable, Dict, Iterable, Iterator, List, Optional, Self
 from uuid import uuid4
 
+from pydantic import Field, TypeAdapter
+
 from pi_ai.types import AssistantMessage, Message, ToolResultMessage, UserMessage
 from pi_ai.utils.serialization import from_wire_message, to_camel_dict, to_snake_dict, to_wire_message
 
 CURRENT_SESSION_VERSION = 3
 
+_encode_json_line = json.JSONEncoder(separators=(",", ":")).encode
+
+_MESSAGE_VALIDATORS: Dict[str, Callable[[Any], Message]] = {
+    "user": UserMessage.model_validate,
+    "assistant": AssistantMessage.model_validate,
+    "tool_result": ToolResultMessage.model_validate,
+}
+_MESSAGE_ROLES = frozenset(_MESSAGE_VALIDATORS)
+_MESSAGE_LIST_ADAPTER: TypeAdapter[List[Message]] = TypeAdapter(
+    List[Annotated[Message, Field(discriminator="role")]]
+)
+
+
+_iso_second_prefix: tuple[int, str] = (-1, "")
+
 
 def _now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat()
+    global _iso_second_prefix
+    second, micros = divmod(time.time_ns() // 1000, 1_000_000)
+    cached_second, prefix = _iso_second_prefix
+    if second != cached_second:
+        prefix = datetime.fromtimestamp(second, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        _iso_second_prefix = (second, prefix)
+    return f"{prefix}.{micros:06d}+00:00"
 
 
-def _generate_id(existing: Iterable[str]) -> str:
-    existing_set = set(existing)
+def _generate_id(existing: set[str]) -> str:
     for _ in range(100):
-        candidate = uuid4().hex[:8]
-        if candidate not in existing_set:
+        candidate = secrets.token_hex(4)
+        if candidate not in existing:
             return candidate
-    return uuid4().hex
+    return secrets.token_hex(16)
+
+
+_O_BINARY = getattr(os, "O_BINARY", 0)
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+def _write_file_bytes(path: str, data: bytes) -> None:
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | _O_BINARY, 0o666)
+    try:
+        _write_all(fd, data)
+    finally:
+        os.close(fd)
 
 
 def _get_agent_dir() -> str:
@@ -65,17 +107,19 @@ def _parse_iso_timestamp(value: str) -> Optional[datetime]:
 
 
 def _from_wire_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
-    data = to_snake_dict(entry)
-    if data.get("type") == "message":
-        data["message"] = from_wire_message(data.get("message"))
+    if entry.get("type") != "message":
+        return to_snake_dict(entry)
+    data = to_snake_dict({key: value for key, value in entry.items() if key != "message"})
+    data["message"] = from_wire_message(entry.get("message"))
     return data
 
 
 def _to_wire_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
-    data = dict(entry)
-    if data.get("type") == "message":
-        data["message"] = to_wire_message(data.get("message"))
-    return to_camel_dict(data)
+    if entry.get("type") != "message":
+        return to_camel_dict(entry)
+    data = to_camel_dict({key: value for key, value in entry.items() if key != "message"})
+    data["message"] = to_wire_message(entry.get("message"))
+    return data
 
 
 def _is_message_with_content(message: Any) -> bool:
@@ -98,19 +142,14 @@ def _extract_text_content(message: Dict[str, Any]) -> str:
 
 
 def _coerce_message(message: Any) -> Any:
-    if isinstance(message, (UserMessage, AssistantMessage, ToolResultMessage)):
-        return message
     if isinstance(message, dict):
         role = message.get("role")
-        try:
-            if role == "user":
-                return UserMessage.model_validate(message)
-            if role == "assistant":
-                return AssistantMessage.model_validate(message)
-            if role == "tool_result":
-                return ToolResultMessage.model_validate(message)
-        except Exception:
-            return message
+        validate = _MESSAGE_VALIDATORS.get(role) if isinstance(role, str) else None
+        if validate is not None:
+            try:
+                return validate(message)
+            except Exception:
+                return message
     return message
 
 
@@ -153,23 +192,25 @@ def _get_session_modified_date(
     return stats_mtime
 
 
+def _iter_wire_records(path: Path) -> Iterator[Dict[str, Any]]:
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(data, dict):
+                yield data
+
+
 def build_session_info(file_path: str) -> Optional[SessionInfo]:
     try:
-        content = Path(file_path).read_text(encoding="utf-8")
-    except Exception:
+        entries = [_from_wire_entry(entry) for entry in _iter_wire_records(Path(file_path))]
+    except (OSError, UnicodeDecodeError):
         return None
 
-    entries: List[Dict[str, Any]] = []
-    for line in content.strip().splitlines():
-        if not line.strip():
-            continue
-        try:
-            entry = json.loads(line)
-        except json.JSONDecodeError:
-            continue
-        if isinstance(entry, dict):
-            entries.append(_from_wire_entry(entry))
-
     if not entries:
         return None
     header = entries[0]
@@ -255,7 +296,7 @@ def list_sessions_from_dir(
     return sessions
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionHeader:
     type: str
     id: str
@@ -277,12 +318,14 @@ class SessionHeader:
         return _to_wire_entry(data)
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionEntry:
     type: str
     id: str
     parent_id: Optional[str]
     timestamp: str
+    _timestamp_ms: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    _json_line: Optional[str] = field(default=None, init=False, repr=False, compare=False)
 
     def to_dict(self) -> Dict[str, Any]:
         data = {
@@ -294,7 +337,7 @@ class SessionEntry:
         return _to_wire_entry(data)
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionMessageEntry(SessionEntry):
     message: Dict[str, Any]
 
@@ -309,7 +352,7 @@ class SessionMessageEntry(SessionEntry):
         return _to_wire_entry(data)
 
 
-@dataclass
+@dataclass(slots=True)
 class ThinkingLevelChangeEntry(SessionEntry):
     thinking_level: str
 
@@ -324,7 +367,7 @@ class ThinkingLevelChangeEntry(SessionEntry):
         return _to_wire_entry(data)
 
 
-@dataclass
+@dataclass(slots=True)
 class ModelChangeEntry(SessionEntry):
     provider: str
     model_id: str
@@ -341,7 +384,7 @@ class ModelChangeEntry(SessionEntry):
         return _to_wire_entry(data)
 
 
-@dataclass
+@dataclass(slots=True)
 class CompactionEntry(SessionEntry):
     summary: str
     first_kept_entry_id: str
@@ -366,7 +409,7 @@ class CompactionEntry(SessionEntry):
         return _to_wire_entry(data)
 
 
-@dataclass
+@dataclass(slots=True)
 class BranchSummaryEntry(SessionEntry):
     from_id: str
     summary: str
@@ -389,7 +432,7 @@ class BranchSummaryEntry(SessionEntry):
         return _to_wire_entry(data)
 
 
-@dataclass
+@dataclass(slots=True)
 class CustomEntry(SessionEntry):
     custom_type: str
     data: Optional[Dict[str, Any]] = None
@@ -407,7 +450,7 @@ class CustomEntry(SessionEntry):
         return _to_wire_entry(data)
 
 
-@dataclass
+@dataclass(slots=True)
 class CustomMessageEntry(SessionEntry):
     custom_type: str
     content: Any
@@ -429,7 +472,7 @@ class CustomMessageEntry(SessionEntry):
         return _to_wire_entry(data)
 
 
-@dataclass
+@dataclass(slots=True)
 class LabelEntry(SessionEntry):
     target_id: str
     label: Optional[str]
@@ -447,7 +490,7 @@ class LabelEntry(SessionEntry):
         return _to_wire_entry(data)
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionInfoEntry(SessionEntry):
     name: Optional[str] = None
 
@@ -493,7 +536,7 @@ SessionEntryType = (
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionTreeNode:
     entry: SessionEntryType
     children: List["SessionTreeNode"]
@@ -507,68 +550,103 @@ class SessionContext:
     model: Optional[Dict[str, str]]
 
 
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _message_entry(base: Dict[str, Any], payload: Dict[str, Any]) -> SessionEntryType:
+    return SessionMessageEntry(**base, message=payload.get("message", {}))
+
+
+def _thinking_level_change_entry(base: Dict[str, Any], payload: Dict[str, Any]) -> SessionEntryType:
+    return ThinkingLevelChangeEntry(
+        **base,
+        thinking_level=payload.get("thinking_level", "off"),
+    )
+
+
+def _model_change_entry(base: Dict[str, Any], payload: Dict[str, Any]) -> SessionEntryType:
+    return ModelChangeEntry(
+        **base,
+        provider=payload.get("provider", ""),
+        model_id=payload.get("model_id", ""),
+    )
+
+
+def _compaction_entry(base: Dict[str, Any], payload: Dict[str, Any]) -> SessionEntryType:
+    return CompactionEntry(
+        **base,
+        summary=payload.get("summary", ""),
+        first_kept_entry_id=payload.get("first_kept_entry_id", ""),
+        tokens_before=payload.get("tokens_before", 0),
+        details=payload.get("details"),
+        from_hook=payload.get("from_hook"),
+    )
+
+
+def _branch_summary_entry(base: Dict[str, Any], payload: Dict[str, Any]) -> SessionEntryType:
+    return BranchSummaryEntry(
+        **base,
+        from_id=payload.get("from_id", ""),
+        summary=payload.get("summary", ""),
+        details=payload.get("details"),
+        from_hook=payload.get("from_hook"),
+    )
+
+
+def _custom_entry(base: Dict[str, Any], payload: Dict[str, Any]) -> SessionEntryType:
+    return CustomEntry(
+        **base,
+        custom_type=_intern(payload.get("custom_type", "")),
+        data=payload.get("data"),
+    )
+
+
+def _custom_message_entry(base: Dict[str, Any], payload: Dict[str, Any]) -> SessionEntryType:
+    return CustomMessageEntry(
+        **base,
+        custom_type=_intern(payload.get("custom_type", "")),
+        content=payload.get("content"),
+        display=bool(payload.get("display", False)),
+        details=payload.get("details"),
+    )
+
+
+def _label_entry(base: Dict[str, Any], payload: Dict[str, Any]) -> SessionEntryType:
+    return LabelEntry(
+        **base,
+        target_id=_intern(payload.get("target_id", "")),
+        label=payload.get("label"),
+    )
+
+
+def _session_info_entry(base: Dict[str, Any], payload: Dict[str, Any]) -> SessionEntryType:
+    return SessionInfoEntry(**base, name=payload.get("name"))
+
+
+_ENTRY_BUILDERS: Dict[str, Callable[[Dict[str, Any], Dict[str, Any]], SessionEntryType]] = {
+    "message": _message_entry,
+    "thinking_level_change": _thinking_level_change_entry,
+    "model_change": _model_change_entry,
+    "compaction": _compaction_entry,
+    "branch_summary": _branch_summary_entry,
+    "custom": _custom_entry,
+    "custom_message": _custom_message_entry,
+    "label": _label_entry,
+    "session_info": _session_info_entry,
+}
+
+
 def _entry_from_dict(payload: Dict[str, Any]) -> SessionEntryType:
-    entry_type = payload.get("type")
-    parent_id = payload.get("parent_id")
+    entry_type = _intern(payload.get("type"))
     base = {
         "type": entry_type,
-        "id": payload.get("id"),
-        "parent_id": parent_id,
-        "timestamp": payload.get("timestamp", _now_iso()),
+        "id": _intern(payload.get("id")),
+        "parent_id": _intern(payload.get("parent_id")),
+        "timestamp": payload["timestamp"] if "timestamp" in payload else _now_iso(),
     }
-    if entry_type == "message":
-        return SessionMessageEntry(**base, message=payload.get("message", {}))
-    if entry_type == "thinking_level_change":
-        return ThinkingLevelChangeEntry(
-            **base,
-            thinking_level=payload.get("thinking_level", "off"),
-        )
-    if entry_type == "model_change":
-        return ModelChangeEntry(
-            **base,
-            provider=payload.get("provider", ""),
-            model_id=payload.get("model_id", ""),
-        )
-    if entry_type == "compaction":
-        return CompactionEntry(
-            **base,
-            summary=payload.get("summary", ""),
-            first_kept_entry_id=payload.get("first_kept_entry_id", ""),
-            tokens_before=payload.get("tokens_before", 0),
-            details=payload.get("details"),
-            from_hook=payload.get("from_hook"),
-        )
-    if entry_type == "branch_summary":
-        return BranchSummaryEntry(
-            **base,
-            from_id=payload.get("from_id", ""),
-            summary=payload.get("summary", ""),
-            details=payload.get("details"),
-            from_hook=payload.get("from_hook"),
-        )
-    if entry_type == "custom":
-        return CustomEntry(
-            **base,
-            custom_type=payload.get("custom_type", ""),
-            data=payload.get("data"),
-        )
-    if entry_type == "custom_message":
-        return CustomMessageEntry(
-            **base,
-            custom_type=payload.get("custom_type", ""),
-            content=payload.get("content"),
-            display=bool(payload.get("display", False)),
-            details=payload.get("details"),
-        )
-    if entry_type == "label":
-        return LabelEntry(
-            **base,
-            target_id=payload.get("target_id", ""),
-            label=payload.get("label"),
-        )
-    if entry_type == "session_info":
-        return SessionInfoEntry(**base, name=payload.get("name"))
-    return SessionMessageEntry(**base, message=payload.get("message", {}))
+    builder = _ENTRY_BUILDERS.get(entry_type, _message_entry)
+    return builder(base, payload)
 
 
 def _normalize_session_header(header: Dict[str, Any]) -> Dict[str, Any]:
@@ -580,38 +658,47 @@ def load_entries_from_file(path: str) -> List[Dict[str, Any]]:
     if not file_path.exists():
         return []
     entries: List[Dict[str, Any]] = []
+    has_header = False
     try:
-        lines = file_path.read_text(encoding="utf-8").splitlines()
-    except Exception:
+        for data in _iter_wire_records(file_path):
+            if data.get("type"):
+                if data["type"] == "session":
+                    has_header = True
+                entries.append(_from_wire_entry(data))
+    except (OSError, UnicodeDecodeError):
         return []
-    for line in lines:
-        if not line.strip():
-            continue
-        try:
-            data = json.loads(line)
-        except json.JSONDecodeError:
-            continue
-        if isinstance(data, dict) and data.get("type"):
-            entries.append(_from_wire_entry(data))
-    if not any(entry.get("type") == "session" for entry in entries):
+    if not has_header:
         return []
     return entries
 
 
+def _read_session_header(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        for data in _iter_wire_records(path):
+            if data.get("type"):
+                return _from_wire_entry(data) if data["type"] == "session" else None
+    except (OSError, UnicodeDecodeError):
+        return None
+    return None
+
+
 def find_most_recent_session(session_dir: str) -> Optional[str]:
     dir_path = Path(session_dir)
     if not dir_path.exists():
         return None
-    candidates: List[Path] = []
+    candidates: List[tuple[float, Path]] = []
     for item in dir_path.iterdir():
         if item.suffix != ".jsonl":
             continue
-        entries = load_entries_from_file(str(item))
-        if entries:
-            candidates.append(item)
-    if not candidates:
-        return None
-    return str(max(candidates, key=lambda p: p.stat().st_mtime))
+        try:
+            candidates.append((item.stat().st_mtime, item))
+        except OSError:
+            continue
+    candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+    for _, item in candidates:
+        if _read_session_header(item) is not None:
+            return str(item)
+    return None
 
 
 def migrate_session_entries(entries: List[Dict[str, Any]]) -> bool:
@@ -620,7 +707,7 @@ def migrate_session_entries(entries: List[Dict[str, Any]]) -> bool:
     changed = False
 
     if version < 2:
-        existing_ids = set()
+        existing_ids: set[str] = set()
         previous_id = None
         for entry in entries:
             if entry.get("type") == "session":
@@ -642,14 +729,14 @@ def migrate_session_entries(entries: List[Dict[str, Any]]) -> bool:
         version = 2
 
     if version < 3:
+        if header is not None:
+            header["version"] = 3
         for entry in entries:
-            if entry.get("type") == "session":
-                entry["version"] = 3
-            if entry.get("type") == "message":
-                message = entry.get("message") or {}
-                if message.get("role") == "hook_message":
-                    message["role"] = "custom"
-                    entry["message"] = message
+            if entry.get("type") != "message":
+                continue
+            message = entry.get("message")
+            if isinstance(message, dict) and message.get("role") == "hook_message":
+                message["role"] = "custom"
         changed = True
 
     return changed
@@ -658,6 +745,41 @@ def migrate_session_entries(entries: List[Dict[str, Any]]) -> bool:
 _LEAF_UNSET = object()
 
 
+def _entry_json_line(entry: SessionHeader | SessionEntryType) -> str:
+    if isinstance(entry, SessionHeader):
+        return _encode_json_line(entry.to_dict()) + "\n"
+    line = entry._json_line
+    if line is None:
+        line = _encode_json_line(entry.to_dict()) + "\n"
+        entry._json_line = line
+    return line
+
+
+def _entry_timestamp_ms(entry: SessionEntryType) -> int:
+    timestamp_ms = entry._timestamp_ms
+    if timestamp_ms is None:
+        timestamp_ms = int(datetime.fromisoformat(entry.timestamp).timestamp() * 1000)
+        entry._timestamp_ms = timestamp_ms
+    return timestamp_ms
+
+
+def _walk_to_root(
+    leaf: SessionEntryType, by_id: Dict[str, SessionEntryType]
+) -> List[SessionEntryType]:
+    path: List[SessionEntryType] = []
+    by_id_get = by_id.get
+    current = leaf
+    # A real path is never longer than the index, so the bound also stops longer parent cycles.
+    for _ in range(len(by_id) + 1):
+        path.append(current)
+        parent = by_id_get(current.parent_id)
+        if parent is None or parent is current:
+            break
+        current = parent
+    path.reverse()
+    return path
+
+
 def build_session_context(
     entries: List[SessionEntryType],
     leaf_id: Optional[str] | object = _LEAF_UNSET,
@@ -676,17 +798,14 @@ def build_session_context(
     if leaf is None:
         return SessionContext(messages=[], thinking_level="off", model=None)
 
-    path: List[SessionEntryType] = []
-    current = leaf
-    while current:
-        path.insert(0, current)
-        current = by_id.get(current.parent_id) if current.parent_id else None
+    path = _walk_to_root(leaf, by_id)
 
     thinking_level = "off"
     model: Optional[Dict[str, str]] = None
     compaction: Optional[CompactionEntry] = None
+    compaction_idx = -1
 
-    for entry in path:
+    for idx, entry in enumerate(path):
         if isinstance(entry, ThinkingLevelChangeEntry):
             thinking_level = entry.thinking_level
         elif isinstance(entry, ModelChangeEntry):
@@ -704,6 +823,7 @@ def build_session_context(
                 model = {"provider": provider, "model_id": model_name}
         elif isinstance(entry, CompactionEntry):
             compaction = entry
+            compaction_idx = idx
 
     messages: List[Any] = []
 
@@ -718,7 +838,7 @@ def build_session_context(
                     "content": entry.content,
                     "display": entry.display,
                     "details": entry.details,
-                    "timestamp": int(datetime.fromisoformat(entry.timestamp).timestamp() * 1000),
+                    "timestamp": _entry_timestamp_ms(entry),
                 }
             )
         elif isinstance(entry, BranchSummaryEntry):
@@ -727,7 +847,7 @@ def build_session_context(
                     "role": "branch_summary",
                     "summary": entry.summary,
                     "from_id": entry.from_id,
-                    "timestamp": int(datetime.fromisoformat(entry.timestamp).timestamp() * 1000),
+                    "timestamp": _entry_timestamp_ms(entry),
                 }
             )
 
@@ -737,12 +857,9 @@ def build_session_context(
                 "role": "compaction_summary",
                 "summary": compaction.summary,
                 "tokens_before": compaction.tokens_before,
-                "timestamp": int(datetime.fromisoformat(compaction.timestamp).timestamp() * 1000),
+                "timestamp": _entry_timestamp_ms(compaction),
             }
         )
-        compaction_idx = next(
-            (idx for idx, entry in enumerate(path) if entry.id == compaction.id), -1
-        )
         found_first_kept = False
         for entry in path[:compaction_idx]:
             if entry.id == compaction.first_kept_entry_id:
@@ -765,11 +882,15 @@ class SessionManager:
         self._session_file = session_file
         self._persist = persist
         self._flushed = False
-        self._file_entries: List[SessionHeader | SessionEntryType] = []
+        self._append_fd: Optional[int] = None
+        self._header: Optional[SessionHeader] = None
+        self._entries: List[SessionEntryType] = []
         self._by_id: Dict[str, SessionEntryType] = {}
         self._labels_by_id: Dict[str, str] = {}
         self._leaf_id: Optional[str] = None
         self._session_id: str = ""
+        self._id_counter = 0
+        self._id_salt = secrets.randbits(32)
 
         if self._persist and self._session_dir:
             Path(self._session_dir).mkdir(parents=True, exist_ok=True)
@@ -786,8 +907,7 @@ class SessionManager:
 
     @classmethod
     def open(cls, path: str, session_dir: Optional[str] = None) -> "SessionManager":
-        entries = load_entries_from_file(path)
-        header = next((e for e in entries if e.get("type") == "session"), None)
+        header = _read_session_header(Path(path))
         cwd = header.get("cwd") if header else os.getcwd()
         return cls(cwd, session_dir or str(Path(path).resolve().parent), path, True)
 
@@ -845,6 +965,7 @@ class SessionManager:
         return cls(cwd or os.getcwd(), "", None, False)
 
     def set_session_file(self, session_file: str) -> None:
+        self.close()
         self._session_file = str(Path(session_file).resolve())
         if Path(self._session_file).exists():
             entries = load_entries_from_file(self._session_file)
@@ -861,14 +982,15 @@ class SessionManager:
 
             header = next((e for e in entries if e.get("type") == "session"), None)
             self._session_id = header.get("id") if header else uuid4().hex
-            self._file_entries = (
-                [SessionHeader(**_normalize_session_header(header))] if header else []
-            )
-            for entry in entries:
-                if entry.get("type") == "session":
+            self._header = SessionHeader(**_normalize_session_header(header)) if header else None
+            self._entries = []
+            self._clear_index()
+            for payload in entries:
+                if payload.get("type") == "session":
                     continue
-                self._file_entries.append(_entry_from_dict(entry))
-            self._build_index()
+                entry = _entry_from_dict(payload)
+                self._entries.append(entry)
+                self._index_entry(entry)
             self._flushed = True
         else:
             explicit = self._session_file
@@ -876,6 +998,7 @@ class SessionManager:
             self._session_file = explicit
 
     def new_session(self, parent_session: Optional[str] = None) -> Optional[str]:
+        self.close()
         self._session_id = uuid4().hex
         timestamp = _now_iso()
         header = SessionHeader(
@@ -886,10 +1009,9 @@ class SessionManager:
             version=CURRENT_SESSION_VERSION,
             parent_session=parent_session,
         )
-        self._file_entries = [header]
-        self._by_id.clear()
-        self._labels_by_id.clear()
-        self._leaf_id = None
+        self._header = header
+        self._entries = []
+        self._clear_index()
         self._flushed = False
 
         if self._persist:
@@ -897,51 +1019,82 @@ class SessionManager:
             self._session_file = str(Path(self._session_dir) / f"{file_timestamp}_{self._session_id}.jsonl")
         return self._session_file
 
-    def _build_index(self) -> None:
+    def _clear_index(self) -> None:
         self._by_id.clear()
         self._labels_by_id.clear()
         self._leaf_id = None
-        for entry in self.get_entries():
-            self._by_id[entry.id] = entry
-            self._leaf_id = entry.id
-            if isinstance(entry, LabelEntry):
-                if entry.label is not None:
-                    self._labels_by_id[entry.target_id] = entry.label
-                else:
-                    self._labels_by_id.pop(entry.target_id, None)
+
+    def _index_entry(self, entry: SessionEntryType) -> None:
+        self._by_id[entry.id] = entry
+        self._leaf_id = entry.id
+        if isinstance(entry, LabelEntry):
+            if entry.label is not None:
+                self._labels_by_id[entry.target_id] = entry.label
+            else:
+                self._labels_by_id.pop(entry.target_id, None)
+
+    def _build_index_from(self, entries: Iterable[SessionEntryType]) -> None:
+        self._clear_index()
+        for entry in entries:
+            self._index_entry(entry)
+
+    def _file_entries(self) -> List[SessionHeader | SessionEntryType]:
+        if self._header is None:
+            return list(self._entries)
+        return [self._header, *self._entries]
 
     def _rewrite_file(self, entries: Optional[List[Dict[str, Any]]] = None) -> None:
         if not self._persist or not self._session_file:
             return
         if entries is None:
-            entries = [entry.to_dict() for entry in self._file_entries]
+            lines = [_entry_json_line(entry) for entry in self._file_entries()]
         else:
-            entries = [_to_wire_entry(entry) for entry in entries]
-        content = "\n".join(json.dumps(entry) for entry in entries) + "\n"
-        Path(self._session_file).write_text(content, encoding="utf-8")
+            lines = [_encode_json_line(_to_wire_entry(entry)) + "\n" for entry in entries]
+        content = "".join(lines)
+        self.close()
+        _write_file_bytes(self._session_file, content.encode("utf-8"))
 
     def _persist_entry(self, entry: SessionEntryType) -> None:
         if not self._persist or not self._session_file:
             return
         if not self._flushed:
-            content = "\n".join(json.dumps(entry.to_dict()) for entry in self._file_entries) + "\n"
-            Path(self._session_file).write_text(content, encoding="utf-8")
+            self._rewrite_file()
             self._flushed = True
             return
-        with Path(self._session_file).open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(entry.to_dict()) + "\n")
+        fd = self._append_fd
+        if fd is None:
+            fd = self._append_fd = os.open(
+                self._session_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT | _O_BINARY, 0o666
+            )
+        _write_all(fd, _entry_json_line(entry).encode("utf-8"))
+
+    def close(self) -> None:
+        if self._append_fd is not None:
+            os.close(self._append_fd)
+            self._append_fd = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        self.close()
 
     def _append_entry(self, entry: SessionEntryType) -> None:
-        self._file_entries.append(entry)
-        self._by_id[entry.id] = entry
-        self._leaf_id = entry.id
-        if isinstance(entry, LabelEntry):
-            if entry.label is not None:
-                self._labels_by_id[entry.target_id] = entry.label
-            else:
-                self._labels_by_id.pop(entry.target_id, None)
+        self._entries.append(entry)
+        self._index_entry(entry)
         self._persist_entry(entry)
 
+    def _next_id(self) -> str:
+        # The odd multiplier keeps counter ids unique; the check covers ids loaded from disk.
+        while True:
+            self._id_counter += 1
+            candidate = f"{((self._id_counter * 0x9E3779B1) ^ self._id_salt) & 0xFFFFFFFF:08x}"
+            if candidate not in self._by_id:
+                return candidate
+
     def is_persisted(self) -> bool:
         return self._persist
 
@@ -958,10 +1111,10 @@ class SessionManager:
         return self._session_file
 
     def get_header(self) -> Optional[SessionHeader]:
-        return next((e for e in self._file_entries if isinstance(e, SessionHeader)), None)
+        return self._header
 
     def get_entries(self) -> List[SessionEntryType]:
-        return [e for e in self._file_entries if not isinstance(e, SessionHeader)]
+        return list(self._entries)
 
     def get_entry(self, entry_id: str) -> SessionEntryType:
         return self._by_id.get(entry_id)
@@ -981,8 +1134,7 @@ class SessionManager:
         return [entry for entry in self._by_id.values() if entry.parent_id == parent_id]
 
     def get_session_name(self) -> Optional[str]:
-        entries = self.get_entries()
-        for entry in reversed(entries):
+        for entry in reversed(self._entries):
             if isinstance(entry, SessionInfoEntry) and entry.name:
                 return entry.name
         return None
@@ -990,7 +1142,7 @@ class SessionManager:
     def append_message(self, message: Message | Dict[str, Any]) -> str:
         entry = SessionMessageEntry(
             type="message",
-            id=_generate_id(self._by_id.keys()),
+            id=self._next_id(),
             parent_id=self._leaf_id,
             timestamp=_now_iso(),
             message=message.model_dump() if hasattr(message, "model_dump") else message,
@@ -1001,7 +1153,7 @@ class SessionManager:
     def append_thinking_level_change(self, level: str) -> str:
         entry = ThinkingLevelChangeEntry(
             type="thinking_level_change",
-            id=_generate_id(self._by_id.keys()),
+            id=self._next_id(),
             parent_id=self._leaf_id,
             timestamp=_now_iso(),
             thinking_level=level,
@@ -1012,7 +1164,7 @@ class SessionManager:
     def append_model_change(self, provider: str, model_id: str) -> str:
         entry = ModelChangeEntry(
             type="model_change",
-            id=_generate_id(self._by_id.keys()),
+            id=self._next_id(),
             parent_id=self._leaf_id,
             timestamp=_now_iso(),
             provider=provider,
@@ -1031,7 +1183,7 @@ class SessionManager:
     ) -> str:
         entry = CompactionEntry(
             type="compaction",
-            id=_generate_id(self._by_id.keys()),
+            id=self._next_id(),
             parent_id=self._leaf_id,
             timestamp=_now_iso(),
             summary=summary,
@@ -1052,7 +1204,7 @@ class SessionManager:
     ) -> str:
         entry = BranchSummaryEntry(
             type="branch_summary",
-            id=_generate_id(self._by_id.keys()),
+            id=self._next_id(),
             parent_id=self._leaf_id,
             timestamp=_now_iso(),
             from_id=from_id,
@@ -1066,7 +1218,7 @@ class SessionManager:
     def append_custom_entry(self, custom_type: str, data: Optional[Dict[str, Any]] = None) -> str:
         entry = CustomEntry(
             type="custom",
-            id=_generate_id(self._by_id.keys()),
+            id=self._next_id(),
             parent_id=self._leaf_id,
             timestamp=_now_iso(),
             custom_type=custom_type,
@@ -1084,7 +1236,7 @@ class SessionManager:
     ) -> str:
         entry = CustomMessageEntry(
             type="custom_message",
-            id=_generate_id(self._by_id.keys()),
+            id=self._next_id(),
             parent_id=self._leaf_id,
             timestamp=_now_iso(),
             custom_type=custom_type,
@@ -1098,7 +1250,7 @@ class SessionManager:
     def append_label_change(self, target_id: str, label: Optional[str]) -> str:
         entry = LabelEntry(
             type="label",
-            id=_generate_id(self._by_id.keys()),
+            id=self._next_id(),
             parent_id=self._leaf_id,
             timestamp=_now_iso(),
             target_id=target_id,
@@ -1113,7 +1265,7 @@ class SessionManager:
             trimmed = None
         entry = SessionInfoEntry(
             type="session_info",
-            id=_generate_id(self._by_id.keys()),
+            id=self._next_id(),
             parent_id=self._leaf_id,
             timestamp=_now_iso(),
             name=trimmed,
@@ -1129,38 +1281,28 @@ class SessionManager:
         current = self._by_id.get(entry_id)
         if current is None:
             return []
-        path: List[SessionEntryType] = []
-        while current:
-            path.insert(0, current)
-            current = self._by_id.get(current.parent_id) if current.parent_id else None
-        return path
+        return _walk_to_root(current, self._by_id)
 
     def get_tree(self) -> List[SessionTreeNode]:
-        entries = self.get_entries()
+        entries = self._entries
         node_map: Dict[str, SessionTreeNode] = {}
         roots: List[SessionTreeNode] = []
+        label_get = self._labels_by_id.get
 
         for entry in entries:
-            node_map[entry.id] = SessionTreeNode(
-                entry=entry, children=[], label=self._labels_by_id.get(entry.id)
-            )
+            node_map[entry.id] = SessionTreeNode(entry=entry, children=[], label=label_get(entry.id))
 
         for entry in entries:
-            node = node_map[entry.id]
-            if entry.parent_id is None or entry.parent_id == entry.id:
-                roots.append(node)
-            else:
-                parent = node_map.get(entry.parent_id)
-                if parent:
-                    parent.children.append(node)
-                else:
-                    roots.append(node)
-
-        stack = list(roots)
-        while stack:
-            node = stack.pop()
-            node.children.sort(key=lambda n: n.entry.timestamp)
-            stack.extend(node.children)
+            parent_id = entry.parent_id
+            if parent_id is None or parent_id == entry.id or parent_id not in node_map:
+                roots.append(node_map[entry.id])
+
+        for entry in sorted(entries, key=lambda e: e.timestamp):
+            parent_id = entry.parent_id
+            if parent_id is not None and parent_id != entry.id:
+                parent = node_map.get(parent_id)
+                if parent is not None:
+                    parent.children.append(node_map[entry.id])
         return roots
 
     def branch(self, branch_from_id: str) -> None:
@@ -1183,7 +1325,7 @@ class SessionManager:
         self._leaf_id = branch_from_id
         entry = BranchSummaryEntry(
             type="branch_summary",
-            id=_generate_id(self._by_id.keys()),
+            id=self._next_id(),
             parent_id=branch_from_id,
             timestamp=_now_iso(),
             from_id=branch_from_id or "root",
@@ -1199,7 +1341,12 @@ class SessionManager:
         if not path:
             raise ValueError(f"Entry {leaf_id} not found")
 
-        path_without_labels = [entry for entry in path if not isinstance(entry, LabelEntry)]
+        path_without_labels: List[SessionEntryType] = []
+        used_ids: set[str] = set()
+        for entry in path:
+            if entry.type != "label":
+                path_without_labels.append(entry)
+                used_ids.add(entry.id)
         new_session_id = uuid4().hex
         timestamp = _now_iso()
         header = SessionHeader(
@@ -1211,11 +1358,11 @@ class SessionManager:
             parent_session=self._session_file if self._persist else None,
         )
 
-        path_entry_ids = {entry.id for entry in path_without_labels}
+        label_get = self._labels_by_id.get
         labels_to_write = [
-            {"target_id": target_id, "label": label}
-            for target_id, label in self._labels_by_id.items()
-            if target_id in path_entry_ids
+            {"target_id": entry.id, "label": label}
+            for entry in path_without_labels
+            if (label := label_get(entry.id)) is not None
         ]
 
         label_entries: List[LabelEntry] = []
@@ -1223,18 +1370,20 @@ class SessionManager:
         for item in labels_to_write:
             label_entry = LabelEntry(
                 type="label",
-                id=_generate_id(path_entry_ids | {e.id for e in label_entries}),
+                id=_generate_id(used_ids),
                 parent_id=parent_id,
                 timestamp=_now_iso(),
                 target_id=item["target_id"],
                 label=item["label"],
             )
             label_entries.append(label_entry)
+            used_ids.add(label_entry.id)
             parent_id = label_entry.id
 
-        self._file_entries = [header, *path_without_labels, *label_entries]
+        self._header = header
+        self._entries = [*path_without_labels, *label_entries]
         self._session_id = new_session_id
-        self._build_index()
+        self._build_index_from(self._entries)
 
         if not self._persist:
             return None
@@ -1246,19 +1395,15 @@ class SessionManager:
         return new_file
 
     def load_messages(self) -> List[Message]:
-        messages: List[Message] = []
-        for entry in self.get_entries():
-            if not isinstance(entry, SessionMessageEntry):
+        payloads: List[Any] = []
+        for entry in self._entries:
+            if entry.type != "message":
                 continue
             payload = entry.message
             role = payload.get("role") if isinstance(payload, dict) else getattr(payload, "role", None)
-            if role == "user":
-                messages.append(UserMessage.model_validate(payload))
-            elif role == "assistant":
-                messages.append(AssistantMessage.model_validate(payload))
-            elif role == "tool_result":
-                messages.append(ToolResultMessage.model_validate(payload))
-        return messages
+            if role in _MESSAGE_ROLES:
+                payloads.append(payload)
+        return _MESSAGE_LIST_ADAPTER.validate_python(payloads)
 
     def build_session_context(self) -> SessionContext:
-        return build_session_context(self.get_entries(), self._leaf_id, self._by_id)
+        return build_session_context(self._entries, self._leaf_id, self._by_id)
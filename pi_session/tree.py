@@ -6,7 +6,7 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionNode:
     node_id: str
     parent_id: Optional[str]
@@ -25,32 +25,34 @@ class SessionTree:
         self._nodes[node_id] = SessionNode(node_id=node_id, parent_id=None)
 
     def add_child(self, parent_id: str, node_id: str) -> None:
-        if parent_id not in self._nodes:
+        nodes = self._nodes
+        parent = nodes.get(parent_id)
+        if parent is None:
             raise KeyError(f"Parent not found: {parent_id}")
-        if node_id in self._nodes:
+        if node_id in nodes:
             raise ValueError(f"Node already exists: {node_id}")
-        self._nodes[node_id] = SessionNode(node_id=node_id, parent_id=parent_id)
-        self._nodes[parent_id].children.append(node_id)
+        nodes[node_id] = SessionNode(node_id=node_id, parent_id=parent_id)
+        parent.children.append(node_id)
 
     def get_node(self, node_id: str) -> SessionNode:
-        if node_id not in self._nodes:
-            raise KeyError(f"Node not found: {node_id}")
-        return self._nodes[node_id]
+        try:
+            return self._nodes[node_id]
+        except KeyError:
+            raise KeyError(f"Node not found: {node_id}") from None
 
     def root_id(self) -> Optional[str]:
         return self._root_id
 
     def children(self, node_id: str) -> List[str]:
-        return list(self.get_node(node_id).children)
+        return self.get_node(node_id).children.copy()
 
     def path_to_root(self, node_id: str) -> List[str]:
-        path: List[str] = []
+        nodes = self._nodes
         current = self.get_node(node_id)
-        while current:
+        path = [current.node_id]
+        while current.parent_id is not None:
+            current = nodes[current.parent_id]
             path.append(current.node_id)
-            if current.parent_id is None:
-                break
-            current = self.get_node(current.parent_id)
         return path
 
     def ancestors(self, node_id: str) -> List[str]:
@@ -61,7 +63,7 @@ class SessionTree:
         return {
             node_id: {
                 "parent_id": node.parent_id,
-                "children": list(node.children),
+                "children": node.children.copy(),
             }
             for node_id, node in self._nodes.items()
         }
@@ -12,13 +12,13 @@ ToolContent = TextContent | ImageContent
 ToolUpdateCallback = Callable[["ToolResult"], None]
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolResult:
     content: List[ToolContent]
     details: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolDefinition:
     name: str
     label: str
@@ -3,11 +3,12 @@
 from __future__ import annotations
 
 import asyncio
-import secrets
+import os
 import tempfile
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Awaitable, Callable, Dict, Optional
+from typing import Awaitable, BinaryIO, Callable, Dict, Optional
 
 from pi_ai.types import TextContent
 
@@ -24,14 +25,19 @@ BASH_SCHEMA: Dict[str, object] = {
     "required": ["command"],
 }
 
+_READ_CHUNK_SIZE = 65536
+_TEMP_FILE_BUFFER_SIZE = 1 << 20
+_UPDATE_MIN_BYTES = 4096
+_UPDATE_MIN_INTERVAL = 0.05
 
-@dataclass
+
+@dataclass(slots=True)
 class BashToolDetails:
     truncation: Optional[TruncationResult] = None
     full_output_path: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class BashOperations:
     exec: Callable[
         [
@@ -43,7 +49,7 @@ class BashOperations:
     ]
 
 
-@dataclass
+@dataclass(slots=True)
 class BashSpawnContext:
     command: str
     cwd: str
@@ -79,7 +85,7 @@ async def _default_exec(command: str, cwd: str, options: Dict[str, object]) -> D
 
     async def _pump(stream: asyncio.StreamReader) -> None:
         while True:
-            chunk = await stream.read(1024)
+            chunk = await stream.read(_READ_CHUNK_SIZE)
             if not chunk:
                 break
             if on_data:
@@ -88,29 +94,25 @@ async def _default_exec(command: str, cwd: str, options: Dict[str, object]) -> D
     stdout_task = asyncio.create_task(_pump(process.stdout))
     stderr_task = asyncio.create_task(_pump(process.stderr))
 
-    start_time = asyncio.get_event_loop().time()
+    wait_task = asyncio.ensure_future(process.wait())
+    abort_task = asyncio.ensure_future(signal.wait()) if isinstance(signal, asyncio.Event) else None
     try:
-        while True:
-            if signal is not None and isinstance(signal, asyncio.Event) and signal.is_set():
-                if process.pid:
-                    shell_module.kill_process_tree(process.pid)
-                await process.wait()
+        done, _ = await asyncio.wait(
+            {wait_task, abort_task} if abort_task else {wait_task},
+            timeout=timeout if timeout is not None and timeout > 0 else None,
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        if wait_task not in done:
+            if process.pid:
+                shell_module.kill_process_tree(process.pid)
+            await process.wait()
+            if abort_task in done:
                 raise RuntimeError("aborted")
-
-            if timeout is not None and timeout > 0:
-                elapsed = asyncio.get_event_loop().time() - start_time
-                if elapsed >= timeout:
-                    if process.pid:
-                        shell_module.kill_process_tree(process.pid)
-                    await process.wait()
-                    raise RuntimeError(f"timeout:{timeout}")
-
-            try:
-                await asyncio.wait_for(process.wait(), timeout=0.1)
-                break
-            except asyncio.TimeoutError:
-                continue
+            raise RuntimeError(f"timeout:{timeout}")
     finally:
+        wait_task.cancel()
+        if abort_task is not None:
+            abort_task.cancel()
         await asyncio.gather(stdout_task, stderr_task, return_exceptions=True)
 
     return {"exit_code": process.returncode}
@@ -119,16 +121,16 @@ async def _default_exec(command: str, cwd: str, options: Dict[str, object]) -> D
 DEFAULT_BASH_OPERATIONS = BashOperations(exec=_default_exec)
 
 
-@dataclass
+@dataclass(slots=True)
 class BashToolOptions:
     operations: Optional[BashOperations] = None
     command_prefix: Optional[str] = None
     spawn_hook: Optional[BashSpawnHook] = None
 
 
-def _get_temp_file_path() -> str:
-    token = secrets.token_hex(8)
-    return str(Path(tempfile.gettempdir()) / f"pi-bash-{token}.log")
+def _open_temp_file() -> tuple[str, BinaryIO]:
+    fd, path = tempfile.mkstemp(prefix="pi-bash-", suffix=".log")
+    return path, os.fdopen(fd, "wb", buffering=_TEMP_FILE_BUFFER_SIZE)
 
 
 def _resolve_spawn_context(
@@ -161,45 +163,80 @@ def create_bash_tool(cwd: str, options: Optional[BashToolOptions] = None) -> Too
         spawn_context = _resolve_spawn_context(resolved_command, cwd, spawn_hook)
 
         temp_file_path: Optional[str] = None
-        temp_file_handle: Optional[object] = None
+        temp_file_handle: Optional[BinaryIO] = None
         total_bytes = 0
 
-        chunks: list[bytes] = []
-        chunks_bytes = 0
-        max_chunks_bytes = DEFAULT_MAX_BYTES * 2
+        tail_buf = bytearray()
+        max_tail_bytes = DEFAULT_MAX_BYTES * 2
+        last_emit_bytes = 0
+        last_emit_ts = 0.0
+        loop = asyncio.get_running_loop()
+        pending_update: Optional[asyncio.TimerHandle] = None
+        update_error: Optional[Exception] = None
+
+        def tail_text() -> str:
+            return str(memoryview(tail_buf)[-max_tail_bytes:], "utf-8", "replace")
 
         def handle_data(data: bytes) -> None:
-            nonlocal temp_file_path, temp_file_handle, total_bytes, chunks_bytes
+            nonlocal temp_file_path, temp_file_handle, total_bytes, pending_update
             total_bytes += len(data)
 
             if total_bytes > DEFAULT_MAX_BYTES and temp_file_path is None:
-                temp_file_path = _get_temp_file_path()
-                temp_file_handle = open(temp_file_path, "wb")
-                for chunk in chunks:
-                    temp_file_handle.write(chunk)
+                temp_file_path, temp_file_handle = _open_temp_file()
+                temp_file_handle.write(tail_buf)
 
             if temp_file_handle is not None:
                 temp_file_handle.write(data)
 
-            chunks.append(data)
-            chunks_bytes += len(data)
-
-            while chunks_bytes > max_chunks_bytes and len(chunks) > 1:
-                removed = chunks.pop(0)
-                chunks_bytes -= len(removed)
-
-            if on_update:
-                full_text = b"".join(chunks).decode("utf-8", errors="replace")
-                truncation = truncate_tail(full_text)
-                on_update(
-                    ToolResult(
-                        content=[TextContent(text=truncation.content or "")],
-                        details={
-                            "truncation": truncation.__dict__ if truncation.truncated else None,
-                            "full_output_path": temp_file_path,
-                        },
-                    )
+            tail_buf.extend(data)
+            if len(tail_buf) > max_tail_bytes * 2:
+                del tail_buf[:-max_tail_bytes]
+
+            if not on_update or update_error is not None:
+                return
+            if (
+                total_bytes - last_emit_bytes >= _UPDATE_MIN_BYTES
+                or time.monotonic() - last_emit_ts >= _UPDATE_MIN_INTERVAL
+            ):
+                emit_update()
+            elif pending_update is None:
+                pending_update = loop.call_later(_UPDATE_MIN_INTERVAL, deferred_update)
+
+        def deferred_update() -> None:
+            # Runs from the event loop, so keep on_update failures for execute() to raise.
+            nonlocal pending_update, update_error
+            pending_update = None
+            try:
+                flush_update()
+            except Exception as exc:
+                update_error = exc
+
+        def cancel_pending_update() -> None:
+            nonlocal pending_update
+            if pending_update is not None:
+                pending_update.cancel()
+                pending_update = None
+
+        def emit_update() -> None:
+            nonlocal last_emit_bytes, last_emit_ts
+            cancel_pending_update()
+            last_emit_bytes = total_bytes
+            last_emit_ts = time.monotonic()
+            truncation = truncate_tail(tail_text())
+            on_update(
+                ToolResult(
+                    content=[TextContent(text=truncation.content or "")],
+                    details={
+                        "truncation": truncation.__dict__ if truncation.truncated else None,
+                        "full_output_path": temp_file_path,
+                    },
                 )
+            )
+
+        def flush_update() -> None:
+            cancel_pending_update()
+            if on_update and total_bytes != last_emit_bytes:
+                emit_update()
 
         try:
             result = await ops.exec(
@@ -215,8 +252,11 @@ def create_bash_tool(cwd: str, options: Optional[BashToolOptions] = None) -> Too
         except Exception as exc:
             if temp_file_handle is not None:
                 temp_file_handle.close()
-            full_buffer = b"".join(chunks)
-            output = full_buffer.decode("utf-8", errors="replace")
+            try:
+                flush_update()
+            except Exception:
+                pass
+            output = tail_text()
             message = str(exc)
             if message == "aborted":
                 if output:
@@ -230,12 +270,16 @@ def create_bash_tool(cwd: str, options: Optional[BashToolOptions] = None) -> Too
                 output += f"Command timed out after {timeout_value} seconds"
                 raise RuntimeError(output) from exc
             raise
+        finally:
+            cancel_pending_update()
 
         if temp_file_handle is not None:
             temp_file_handle.close()
+        if update_error is not None:
+            raise update_error
+        flush_update()
 
-        full_buffer = b"".join(chunks)
-        full_output = full_buffer.decode("utf-8", errors="replace")
+        full_output = tail_text()
 
         truncation = truncate_tail(full_output)
         output_text = truncation.content or "(no output)"
@@ -12,13 +12,13 @@ from pi_ai.types import TextContent
 
 from .base import ToolDefinition, ToolResult
 from .edit_diff import (
+    decode_utf8_text,
     detect_line_ending,
     fuzzy_find_text,
     generate_diff_string,
     normalize_for_fuzzy_match,
     normalize_to_lf,
     restore_line_endings,
-    strip_bom,
 )
 from .path_utils import resolve_to_cwd
 
@@ -47,11 +47,11 @@ class EditOperations:
 
 
 async def _default_read_file(path: str) -> bytes:
-    return Path(path).read_bytes()
+    return await asyncio.to_thread(Path(path).read_bytes)
 
 
 async def _default_write_file(path: str, content: str) -> None:
-    Path(path).write_text(content, encoding="utf-8")
+    await asyncio.to_thread(Path(path).write_text, content, encoding="utf-8")
 
 
 async def _default_access(path: str) -> None:
@@ -96,11 +96,11 @@ def create_edit_tool(cwd: str, options: Optional[EditToolOptions] = None) -> Too
         if signal and signal.is_set():
             raise RuntimeError("Operation aborted")
 
-        raw_content = (await ops.read_file(absolute_path)).decode("utf-8", errors="replace")
+        raw_content = await ops.read_file(absolute_path)
         if signal and signal.is_set():
             raise RuntimeError("Operation aborted")
 
-        bom, content = strip_bom(raw_content)
+        bom, content = decode_utf8_text(raw_content)
         original_ending = detect_line_ending(content)
         normalized_content = normalize_to_lf(content)
         normalized_old_text = normalize_to_lf(old_text)
@@ -112,8 +112,12 @@ def create_edit_tool(cwd: str, options: Optional[EditToolOptions] = None) -> Too
                 f"Could not find the exact text in {path}. The old text must match exactly including all whitespace and newlines."
             )
 
-        fuzzy_content = normalize_for_fuzzy_match(normalized_content)
-        fuzzy_old_text = normalize_for_fuzzy_match(normalized_old_text)
+        fuzzy_content = match_result.fuzzy_content
+        if fuzzy_content is None:
+            fuzzy_content = normalize_for_fuzzy_match(normalized_content)
+        fuzzy_old_text = match_result.fuzzy_old_text
+        if fuzzy_old_text is None:
+            fuzzy_old_text = normalize_for_fuzzy_match(normalized_old_text)
         occurrences = fuzzy_content.count(fuzzy_old_text)
         if occurrences > 1:
             raise ValueError(
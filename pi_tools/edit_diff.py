@@ -2,22 +2,22 @@
 
 from __future__ import annotations
 
+import codecs
 import re
 from dataclasses import dataclass
 from typing import Optional
 
 
 def detect_line_ending(content: str) -> str:
-    crlf_idx = content.find("\r\n")
     lf_idx = content.find("\n")
-    if lf_idx == -1:
-        return "\n"
-    if crlf_idx == -1:
-        return "\n"
-    return "\r\n" if crlf_idx < lf_idx else "\n"
+    if lf_idx > 0 and content[lf_idx - 1] == "\r":
+        return "\r\n"
+    return "\n"
 
 
 def normalize_to_lf(text: str) -> str:
+    if "\r" not in text:
+        return text
     return text.replace("\r\n", "\n").replace("\r", "\n")
 
 
@@ -35,6 +35,8 @@ _UNICODE_SPACES = re.compile(r"[\u00A0\u2002-\u200A\u202F\u205F\u3000]")
 
 def normalize_for_fuzzy_match(text: str) -> str:
     trimmed = "\n".join(line.rstrip() for line in text.split("\n"))
+    if trimmed.isascii():
+        return trimmed
     trimmed = _SMART_SINGLE_QUOTES.sub("'", trimmed)
     trimmed = _SMART_DOUBLE_QUOTES.sub('"', trimmed)
     trimmed = _UNICODE_DASHES.sub("-", trimmed)
@@ -49,6 +51,8 @@ class FuzzyMatchResult:
     match_length: int
     used_fuzzy_match: bool
     content_for_replacement: str
+    fuzzy_content: Optional[str] = None
+    fuzzy_old_text: Optional[str] = None
 
 
 def fuzzy_find_text(content: str, old_text: str) -> FuzzyMatchResult:
@@ -72,6 +76,8 @@ def fuzzy_find_text(content: str, old_text: str) -> FuzzyMatchResult:
             match_length=0,
             used_fuzzy_match=False,
             content_for_replacement=content,
+            fuzzy_content=fuzzy_content,
+            fuzzy_old_text=fuzzy_old,
         )
 
     return FuzzyMatchResult(
@@ -80,13 +86,14 @@ def fuzzy_find_text(content: str, old_text: str) -> FuzzyMatchResult:
         match_length=len(fuzzy_old),
         used_fuzzy_match=True,
         content_for_replacement=fuzzy_content,
+        fuzzy_content=fuzzy_content,
+        fuzzy_old_text=fuzzy_old,
     )
 
 
-def strip_bom(content: str) -> tuple[str, str]:
-    if content.startswith("\ufeff"):
-        return "\ufeff", content[1:]
-    return "", content
+def decode_utf8_text(raw: bytes) -> tuple[str, str]:
+    bom = "\ufeff" if raw.startswith(codecs.BOM_UTF8) else ""
+    return bom, raw.decode("utf-8-sig", errors="replace")
 
 
 def generate_diff_string(
@@ -101,8 +108,24 @@ def generate_diff_string(
     max_line_num = max(len(old_lines), len(new_lines), 1)
     line_num_width = len(str(max_line_num))
 
-    matcher = difflib.SequenceMatcher(None, old_lines, new_lines)
-    opcodes = matcher.get_opcodes()
+    old_len = len(old_lines)
+    new_len = len(new_lines)
+    limit = min(old_len, new_len)
+    prefix = 0
+    while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old_lines[old_len - 1 - suffix] == new_lines[new_len - 1 - suffix]:
+        suffix += 1
+
+    matcher = difflib.SequenceMatcher(None, old_lines[prefix : old_len - suffix], new_lines[prefix : new_len - suffix])
+    opcodes = [
+        (tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix) for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+    ]
+    if prefix:
+        opcodes.insert(0, ("equal", 0, prefix, 0, prefix))
+    if suffix:
+        opcodes.append(("equal", old_len - suffix, old_len, new_len - suffix, new_len))
 
     output: list[str] = []
     old_line_num = 1
@@ -5,7 +5,6 @@ from __future__ import annotations
 import os
 import re
 import unicodedata
-from pathlib import Path
 
 UNICODE_SPACES = re.compile(r"[\u00A0\u2000-\u200A\u202F\u205F\u3000]")
 NARROW_NO_BREAK_SPACE = "\u202F"
@@ -40,7 +39,7 @@ def resolve_to_cwd(path: str, cwd: str) -> str:
     expanded = expand_path(path)
     if os.path.isabs(expanded):
         return expanded
-    return str(Path(cwd, expanded).resolve())
+    return os.path.abspath(os.path.join(cwd, expanded))
 
 
 def resolve_read_path(path: str, cwd: str) -> str:
@@ -6,9 +6,9 @@ import asyncio
 import base64
 import io
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Awaitable, Callable, Dict, Optional
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
 
 from pi_ai.types import ImageContent, TextContent
 
@@ -16,6 +16,11 @@ from .base import ToolDefinition, ToolResult
 from .path_utils import resolve_read_path
 from .truncate import DEFAULT_MAX_BYTES, DEFAULT_MAX_LINES, format_size, truncate_head
 
+_T = TypeVar("_T")
+
+_HEAD_DECODE_BYTES = DEFAULT_MAX_BYTES + 1
+_HEAD_SCAN_CHUNK_SIZE = 1 << 20
+
 READ_SCHEMA: Dict[str, object] = {
     "type": "object",
     "properties": {
@@ -40,7 +45,7 @@ def _detect_image_mime_from_bytes(data: bytes) -> Optional[str]:
 
 
 async def _detect_image_mime_from_file(path: str) -> Optional[str]:
-    with open(path, "rb") as handle:
+    with open(path, "rb", buffering=0) as handle:
         header = handle.read(32)
     return _detect_image_mime_from_bytes(header)
 
@@ -74,15 +79,69 @@ def _resize_image_if_needed(data: bytes, mime_type: str, max_dim: int) -> tuple[
         return data, None, mime_type
 
 
+@dataclass
+class FileHead:
+    data: bytes
+    total_bytes: int
+    total_lines: int
+    first_line_bytes: int
+
+
 @dataclass
 class ReadOperations:
     read_file: Callable[[str], Awaitable[bytes]]
     access: Callable[[str], Awaitable[None]]
     detect_image_mime_type: Optional[Callable[[str], Awaitable[Optional[str]]]] = None
+    read_head: Optional[Callable[[str, int], Awaitable[FileHead]]] = None
+
+
+def _read_file_unbuffered(path: str) -> bytes:
+    with open(path, "rb", buffering=0) as handle:
+        return handle.read()
 
 
 async def _default_read_file(path: str) -> bytes:
-    return Path(path).read_bytes()
+    return await asyncio.to_thread(_read_file_unbuffered, path)
+
+
+def _file_head_from_bytes(raw: bytes, size: int) -> FileHead:
+    first_newline = raw.find(b"\n")
+    return FileHead(
+        data=raw[:size],
+        total_bytes=len(raw),
+        total_lines=raw.count(b"\n") + 1,
+        first_line_bytes=first_newline if first_newline != -1 else len(raw),
+    )
+
+
+def _scan_file_head(path: str, size: int) -> FileHead:
+    head = b""
+    total_bytes = 0
+    newlines = 0
+    first_newline = -1
+    with open(path, "rb", buffering=0) as handle:
+        while True:
+            chunk = handle.read(_HEAD_SCAN_CHUNK_SIZE)
+            if not chunk:
+                break
+            if len(head) < size:
+                head += chunk[: size - len(head)]
+            if first_newline == -1:
+                index = chunk.find(b"\n")
+                if index != -1:
+                    first_newline = total_bytes + index
+            newlines += chunk.count(b"\n")
+            total_bytes += len(chunk)
+    return FileHead(
+        data=head,
+        total_bytes=total_bytes,
+        total_lines=newlines + 1,
+        first_line_bytes=first_newline if first_newline != -1 else total_bytes,
+    )
+
+
+async def _default_read_head(path: str, size: int) -> FileHead:
+    return await asyncio.to_thread(_scan_file_head, path, size)
 
 
 async def _default_access(path: str) -> None:
@@ -90,10 +149,28 @@ async def _default_access(path: str) -> None:
         raise FileNotFoundError(path)
 
 
+async def _read_unless_aborted(read: Awaitable[_T], signal: Optional[asyncio.Event]) -> _T:
+    if not isinstance(signal, asyncio.Event):
+        return await read
+    read_task = asyncio.ensure_future(read)
+    abort_task = asyncio.ensure_future(signal.wait())
+    try:
+        await asyncio.wait((read_task, abort_task), return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        abort_task.cancel()
+        aborted = not read_task.done()
+        if aborted:
+            read_task.cancel()
+    if aborted:
+        raise RuntimeError("Operation aborted")
+    return read_task.result()
+
+
 DEFAULT_READ_OPERATIONS = ReadOperations(
     read_file=_default_read_file,
     access=_default_access,
     detect_image_mime_type=_detect_image_mime_from_file,
+    read_head=_default_read_head,
 )
 
 
@@ -135,12 +212,14 @@ def create_read_tool(cwd: str, options: Optional[ReadToolOptions] = None) -> Too
             mime_type = await ops.detect_image_mime_type(absolute_path)
 
         if mime_type:
-            data = await ops.read_file(absolute_path)
+            data = await _read_unless_aborted(ops.read_file(absolute_path), signal)
             if auto_resize_images:
                 data, resize_note, mime_type = _resize_image_if_needed(data, mime_type, 2000)
             else:
                 resize_note = None
-            encoded = base64.b64encode(data).decode("ascii")
+            encoded_bytes = base64.b64encode(data)
+            del data
+            encoded = encoded_bytes.decode("ascii")
             text_note = f"Read image file [{mime_type}]"
             if resize_note:
                 text_note += f"\n{resize_note}"
@@ -150,28 +229,47 @@ def create_read_tool(cwd: str, options: Optional[ReadToolOptions] = None) -> Too
             ]
             return ToolResult(content=content, details=None)
 
-        text = (await ops.read_file(absolute_path)).decode("utf-8", errors="replace")
-        lines = text.split("\n")
-        total_lines = len(lines)
-
         start_line = 0
         if isinstance(offset, (int, float)):
             start_line = max(0, int(offset) - 1)
-        if start_line >= total_lines:
-            raise ValueError(f"Offset {offset} is beyond end of file ({total_lines} lines total)")
 
-        selected = lines[start_line:]
         user_limited_lines: Optional[int] = None
-        if isinstance(limit, (int, float)):
-            end_line = min(start_line + int(limit), total_lines)
-            selected = lines[start_line:end_line]
-            user_limited_lines = end_line - start_line
+        head: Optional[FileHead] = None
+        if start_line == 0 and not isinstance(limit, (int, float)):
+            if ops.read_head:
+                head = await _read_unless_aborted(ops.read_head(absolute_path, _HEAD_DECODE_BYTES), signal)
+            else:
+                raw = await _read_unless_aborted(ops.read_file(absolute_path), signal)
+                head = _file_head_from_bytes(raw, _HEAD_DECODE_BYTES)
+                del raw
+            total_lines = head.total_lines
+            selected_text = head.data.decode("utf-8", errors="replace")
+        else:
+            raw = await _read_unless_aborted(ops.read_file(absolute_path), signal)
+            text = raw.decode("utf-8", errors="replace")
+            lines = text.split("\n")
+            total_lines = len(lines)
+            if start_line >= total_lines:
+                raise ValueError(f"Offset {offset} is beyond end of file ({total_lines} lines total)")
+
+            selected = lines[start_line:]
+            if isinstance(limit, (int, float)):
+                end_line = min(start_line + int(limit), total_lines)
+                selected = lines[start_line:end_line]
+                user_limited_lines = end_line - start_line
+            selected_text = "\n".join(selected)
 
-        selected_text = "\n".join(selected)
         truncation = truncate_head(selected_text)
+        head_only = head is not None and head.total_bytes > len(head.data)
+        if head_only:
+            truncation = replace(truncation, total_lines=head.total_lines, total_bytes=head.total_bytes)
 
         if truncation.first_line_exceeds_limit:
-            line_size = format_size(len(lines[start_line].encode("utf-8")))
+            if head_only:
+                line_bytes = head.first_line_bytes
+            else:
+                line_bytes = len(selected_text.partition("\n")[0].encode("utf-8"))
+            line_size = format_size(line_bytes)
             message = (
                 f"[Line {start_line + 1} is {line_size}, exceeds {format_size(DEFAULT_MAX_BYTES)} limit. "
                 f"Use bash: sed -n '{start_line + 1}p' {path} | head -c {DEFAULT_MAX_BYTES}]"
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import os
-from pathlib import Path
 from typing import Dict, List
 
 
@@ -16,11 +15,11 @@ def get_shell_config() -> Dict[str, object]:
         return _CACHED_SHELL
 
     shell_path = os.environ.get("SHELL")
-    if shell_path and Path(shell_path).exists():
+    if shell_path and os.path.exists(shell_path):
         _CACHED_SHELL = {"shell": shell_path, "args": ["-c"]}
         return _CACHED_SHELL
 
-    if Path("/bin/bash").exists():
+    if os.path.exists("/bin/bash"):
         _CACHED_SHELL = {"shell": "/bin/bash", "args": ["-c"]}
         return _CACHED_SHELL
 
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Awaitable, Callable, Dict, Optional
@@ -29,11 +30,12 @@ class WriteOperations:
 
 
 async def _default_write_file(path: str, content: str) -> None:
-    Path(path).write_text(content, encoding="utf-8")
+    await asyncio.to_thread(Path(path).write_text, content, encoding="utf-8")
 
 
 async def _default_mkdir(path: str) -> None:
-    Path(path).mkdir(parents=True, exist_ok=True)
+    if not os.path.isdir(path):
+        os.makedirs(path, exist_ok=True)
 
 
 DEFAULT_WRITE_OPERATIONS = WriteOperations(write_file=_default_write_file, mkdir=_default_mkdir)
@@ -59,7 +61,7 @@ def create_write_tool(cwd: str, options: Optional[WriteToolOptions] = None) -> T
         path = str(params.get("path"))
         content = str(params.get("content", ""))
         absolute_path = resolve_to_cwd(path, cwd)
-        directory = str(Path(absolute_path).parent)
+        directory = os.path.dirname(absolute_path)
 
         await ops.mkdir(directory)
         if signal and signal.is_set():
@@ -179,3 +179,15 @@ def test_build_context_branches_and_branch_summary():
     ctx = build_session_context(entries)
     assert get_role(ctx.messages[2]) == "branch_summary"
     assert "Summary" in ctx.messages[2]["summary"]
+
+
+def test_build_context_summary_timestamps_are_stable():
+    entries = [
+        msg("1", None, "user", "a"),
+        compaction("2", "1", "Summary", "1"),
+        branch_summary("3", "2", "Branch", "1"),
+    ]
+    ctx = build_session_context(entries)
+    summaries = [m for m in ctx.messages if isinstance(m, dict)]
+    assert [m["timestamp"] for m in summaries] == [1735689600000, 1735689600000]
+    assert build_session_context(entries).messages == ctx.messages
@@ -1,4 +1,5 @@
 import json
+import os
 from pathlib import Path
 
 from pi_session import find_most_recent_session, load_entries_from_file, SessionManager
@@ -65,6 +66,28 @@ def test_find_most_recent_session(tmp_path):
     assert find_most_recent_session(str(tmp_path)) == str(newer)
 
 
+def test_find_most_recent_session_skips_newer_invalid_files(tmp_path):
+    valid = tmp_path / "valid.jsonl"
+    valid.write_text('{"type":"session","id":"abc","timestamp":"2025-01-01T00:00:00Z","cwd":"/tmp"}\n')
+    headerless = tmp_path / "headerless.jsonl"
+    headerless.write_text('{"type":"message","id":"1"}\n')
+    os.utime(valid, (1_000, 1_000))
+    os.utime(headerless, (2_000, 2_000))
+    assert find_most_recent_session(str(tmp_path)) == str(valid)
+
+
+def test_open_reads_cwd_from_header(tmp_path):
+    path = tmp_path / "session.jsonl"
+    path.write_text(
+        '{"type":"session","id":"abc","timestamp":"2025-01-01T00:00:00Z","cwd":"/work","version":3}\n',
+        encoding="utf-8",
+    )
+    manager = SessionManager.open(str(path))
+    assert manager.get_cwd() == "/work"
+    assert manager.get_session_id() == "abc"
+    manager.close()
+
+
 def test_open_recovers_corrupted_file(tmp_path):
     empty = tmp_path / "empty.jsonl"
     empty.write_text("", encoding="utf-8")
@@ -1,7 +1,10 @@
 import json
+from datetime import datetime, timezone
+from pathlib import Path
 
-from pi_ai.types import UserMessage
-from pi_session.manager import SessionManager
+from pi_ai.types import AssistantMessage, ToolResultMessage, UserMessage
+from pi_session.manager import SessionManager, _now_iso
+from tests.session.helpers import assistant_msg, user_msg
 
 
 def test_session_manager_writes_header(tmp_path):
@@ -15,6 +18,23 @@ def test_session_manager_writes_header(tmp_path):
     assert "id" in header
 
 
+def test_appends_survive_close_and_reopen(tmp_path):
+    path = tmp_path / "session.jsonl"
+    manager = SessionManager.open(str(path))
+    manager.append_message(UserMessage(content="one"))
+    manager.append_message(UserMessage(content="two"))
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 3
+
+    manager.close()
+    manager.append_message(UserMessage(content="three"))
+    manager.close()
+
+    with SessionManager.open(str(path)) as reopened:
+        assert [msg.content for msg in reopened.load_messages()] == ["one", "two", "three"]
+        reopened.append_message(UserMessage(content="four"))
+    assert reopened._append_fd is None
+
+
 def test_load_messages(tmp_path):
     path = tmp_path / "session.jsonl"
     manager = SessionManager.open(str(path))
@@ -26,6 +46,26 @@ def test_load_messages(tmp_path):
     assert [msg.content for msg in loaded] == ["hello", "world"]
 
 
+def test_load_messages_preserves_order_across_roles():
+    manager = SessionManager.in_memory()
+    manager.append_message(user_msg("hello"))
+    manager.append_message(assistant_msg("hi"))
+    manager.append_custom_message("note", "ignored", True)
+    manager.append_message(
+        {"role": "tool_result", "tool_call_id": "call_1", "tool_name": "read", "content": [], "timestamp": 1}
+    )
+    manager.append_message(user_msg("again"))
+
+    loaded = manager.load_messages()
+    assert [type(msg) for msg in loaded] == [
+        UserMessage,
+        AssistantMessage,
+        ToolResultMessage,
+        UserMessage,
+    ]
+    assert loaded[-1].content == "again"
+
+
 def test_get_session_name(tmp_path):
     path = tmp_path / "session.jsonl"
     manager = SessionManager.open(str(path))
@@ -36,3 +76,31 @@ def test_get_session_name(tmp_path):
 
     manager.append_session_info("   ")
     assert manager.get_session_name() == "My Session"
+
+
+def test_generated_ids_are_unique_short_hex():
+    manager = SessionManager.in_memory()
+    ids = [manager.append_message(user_msg(str(i))) for i in range(500)]
+    assert len(set(ids)) == len(ids)
+    assert all(len(entry_id) == 8 and int(entry_id, 16) >= 0 for entry_id in ids)
+
+
+def test_branched_session_file_repeats_original_entry_lines(tmp_path):
+    manager = SessionManager.create(str(tmp_path), str(tmp_path))
+    first_id = manager.append_message(user_msg("hello"))
+    manager.append_message(assistant_msg("hi"))
+    original_lines = Path(manager.get_session_file()).read_text(encoding="utf-8").splitlines()
+
+    new_file = manager.create_branched_session(first_id)
+    branched_lines = Path(new_file).read_text(encoding="utf-8").splitlines()
+    assert branched_lines[1:] == original_lines[1:2]
+    assert json.loads(branched_lines[0])["type"] == "session"
+    manager.close()
+
+
+def test_now_iso_matches_utc_clock():
+    before = datetime.now(timezone.utc)
+    stamp = _now_iso()
+    after = datetime.now(timezone.utc)
+    assert stamp.endswith("+00:00")
+    assert before <= datetime.fromisoformat(stamp) <= after
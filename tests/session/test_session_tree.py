@@ -0,0 +1,29 @@
+import pytest
+
+from pi_session.tree import SessionTree
+
+
+def build_tree() -> SessionTree:
+    tree = SessionTree()
+    tree.add_root("a")
+    tree.add_child("a", "b")
+    tree.add_child("b", "c")
+    tree.add_child("a", "d")
+    return tree
+
+
+def test_path_to_root_and_ancestors():
+    tree = build_tree()
+    assert tree.path_to_root("c") == ["c", "b", "a"]
+    assert tree.ancestors("c") == ["b", "a"]
+    assert tree.path_to_root("a") == ["a"]
+
+
+def test_missing_nodes_raise_key_error():
+    tree = build_tree()
+    with pytest.raises(KeyError, match="Node not found: missing"):
+        tree.get_node("missing")
+    with pytest.raises(KeyError, match="Parent not found: missing"):
+        tree.add_child("missing", "x")
+    with pytest.raises(ValueError, match="Node already exists: b"):
+        tree.add_child("a", "b")
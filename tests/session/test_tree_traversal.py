@@ -66,6 +66,15 @@ def test_get_branch_paths():
     assert [e.id for e in branch] == [id1, id2]
 
 
+def test_get_branch_stops_at_self_parented_entry():
+    session = SessionManager.in_memory()
+    id1 = session.append_message(user_msg("1"))
+    id2 = session.append_message(assistant_msg("2"))
+    session.get_entry(id1).parent_id = id1
+
+    assert [e.id for e in session.get_branch(id2)] == [id1, id2]
+
+
 def test_get_tree_and_branching():
     session = SessionManager.in_memory()
     id1 = session.append_message(user_msg("1"))
@@ -85,6 +94,28 @@ def test_get_tree_and_branching():
     assert id4 in branch_ids
 
 
+def test_get_tree_orders_children_by_timestamp(tmp_path):
+    path = tmp_path / "session.jsonl"
+    path.write_text(
+        '{"type":"session","id":"s","timestamp":"2025-01-01T00:00:00Z","cwd":"/tmp","version":3}\n'
+        '{"type":"message","id":"a","parentId":null,"timestamp":"2025-01-01T00:00:01Z",'
+        '"message":{"role":"user","content":"root","timestamp":1}}\n'
+        '{"type":"message","id":"late","parentId":"a","timestamp":"2025-01-01T00:00:09Z",'
+        '"message":{"role":"user","content":"late","timestamp":1}}\n'
+        '{"type":"message","id":"early","parentId":"a","timestamp":"2025-01-01T00:00:02Z",'
+        '"message":{"role":"user","content":"early","timestamp":1}}\n'
+        '{"type":"message","id":"orphan","parentId":"missing","timestamp":"2025-01-01T00:00:00Z",'
+        '"message":{"role":"user","content":"orphan","timestamp":1}}\n',
+        encoding="utf-8",
+    )
+    session = SessionManager.open(str(path))
+
+    tree = session.get_tree()
+    assert [node.entry.id for node in tree] == ["a", "orphan"]
+    assert [child.entry.id for child in tree[0].children] == ["early", "late"]
+    session.close()
+
+
 def test_branch_invalid_raises():
     session = SessionManager.in_memory()
     with pytest.raises(ValueError):
@@ -203,3 +203,31 @@ async def test_edit_preserves_bom(tmp_path: Path) -> None:
     )
 
     assert test_file.read_bytes().decode("utf-8") == "\ufefffirst\r\nREPLACED\r\nthird\r\n"
+
+
+@pytest.mark.asyncio
+async def test_edit_diff_reports_context_around_change(tmp_path: Path) -> None:
+    edit = create_edit_tool(str(tmp_path))
+    test_file = tmp_path / "diff-context.txt"
+    test_file.write_text("".join(f"line {i}\n" for i in range(1, 21)), encoding="utf-8")
+
+    result = await edit.execute(
+        "test-diff",
+        {"path": str(test_file), "old_text": "line 10\n", "new_text": "changed\n"},
+    )
+
+    assert result.details["first_changed_line"] == 10
+    assert result.details["diff"].split("\n") == [
+        "    ...",
+        "  6 line 6",
+        "  7 line 7",
+        "  8 line 8",
+        "  9 line 9",
+        "-10 line 10",
+        "+10 changed",
+        " 11 line 11",
+        " 12 line 12",
+        " 13 line 13",
+        " 14 line 14",
+        "    ...",
+    ]
@@ -16,6 +16,7 @@ def test_resolve_to_cwd():
     assert resolve_to_cwd("/absolute/path/file.txt", "/some/cwd") == "/absolute/path/file.txt"
     result = resolve_to_cwd("relative/file.txt", "/some/cwd")
     assert result.endswith("/some/cwd/relative/file.txt")
+    assert resolve_to_cwd("../other/./file.txt", "/some/cwd") == "/some/other/file.txt"
 
 
 def test_resolve_read_path_variants():
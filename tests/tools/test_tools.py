@@ -1,3 +1,4 @@
+import asyncio
 import base64
 import re
 from pathlib import Path
@@ -6,7 +7,8 @@ import pytest
 
 from pi_ai.types import ImageContent, TextContent
 from pi_tools import create_bash_tool, create_edit_tool, create_read_tool, create_write_tool
-from pi_tools.bash import BashToolOptions
+from pi_tools.bash import BashOperations, BashToolOptions
+from pi_tools.read import DEFAULT_READ_OPERATIONS, FileHead, ReadOperations, ReadToolOptions
 import pi_tools.shell as shell_module
 
 
@@ -279,6 +281,59 @@ async def test_bash_respects_timeout(tmp_path: Path) -> None:
     assert "timed out" in str(excinfo.value).lower()
 
 
+@pytest.mark.asyncio
+async def test_bash_aborts_running_command(tmp_path: Path) -> None:
+    bash = create_bash_tool(str(tmp_path))
+    signal = asyncio.Event()
+    asyncio.get_running_loop().call_later(0.2, signal.set)
+    with pytest.raises(RuntimeError) as excinfo:
+        await asyncio.wait_for(bash.execute("test-call-abort", {"command": "sleep 5"}, signal), timeout=2)
+    assert "Command aborted" in str(excinfo.value)
+
+
+@pytest.mark.asyncio
+async def test_read_uses_bounded_head_read(tmp_path: Path) -> None:
+    test_file = tmp_path / "large.txt"
+    test_file.write_text("x")
+
+    async def read_file(_path: str) -> bytes:
+        raise AssertionError("read_file should not be used without offset/limit")
+
+    async def read_head(_path: str, size: int) -> FileHead:
+        return FileHead(
+            data=b"line\n" * (size // 5 + 1),
+            total_bytes=10_000_000,
+            total_lines=2_000_001,
+            first_line_bytes=4,
+        )
+
+    operations = ReadOperations(read_file=read_file, access=DEFAULT_READ_OPERATIONS.access, read_head=read_head)
+    read = create_read_tool(str(tmp_path), ReadToolOptions(operations=operations))
+    result = await read.execute("test-call-read-head", {"path": str(test_file)})
+
+    assert "[Showing lines 1-2000 of 2000001. Use offset=2001 to continue.]" in get_text_output(result)
+    assert result.details["truncation"]["total_bytes"] == 10_000_000
+
+
+@pytest.mark.asyncio
+async def test_read_aborts_pending_read(tmp_path: Path) -> None:
+    test_file = tmp_path / "slow.txt"
+    test_file.write_text("content")
+    never = asyncio.Event()
+
+    async def slow_read(_path: str) -> bytes:
+        await never.wait()
+        return b""
+
+    operations = ReadOperations(read_file=slow_read, access=DEFAULT_READ_OPERATIONS.access)
+    read = create_read_tool(str(tmp_path), ReadToolOptions(operations=operations))
+    signal = asyncio.Event()
+    asyncio.get_running_loop().call_later(0.1, signal.set)
+    with pytest.raises(RuntimeError) as excinfo:
+        await asyncio.wait_for(read.execute("test-call-read-abort", {"path": str(test_file)}, signal), timeout=2)
+    assert "Operation aborted" in str(excinfo.value)
+
+
 @pytest.mark.asyncio
 async def test_bash_cwd_must_exist(tmp_path: Path) -> None:
     nonexistent = tmp_path / "missing-dir"
@@ -321,3 +376,96 @@ async def test_bash_without_prefix(tmp_path: Path) -> None:
     bash = create_bash_tool(str(tmp_path), BashToolOptions())
     result = await bash.execute("test-prefix-3", {"command": "echo no-prefix"})
     assert get_text_output(result).strip() == "no-prefix"
+
+
+@pytest.mark.asyncio
+async def test_bash_large_output_keeps_tail_and_full_log(tmp_path: Path) -> None:
+    lines = [f"line {i:05d}\n".encode() for i in range(20000)]
+
+    async def _exec(command: str, cwd: str, options: dict) -> dict:
+        for line in lines:
+            options["on_data"](line)
+        return {"exit_code": 0}
+
+    bash = create_bash_tool(str(tmp_path), BashToolOptions(operations=BashOperations(exec=_exec)))
+    result = await bash.execute("test-large-output", {"command": "ignored"})
+
+    output = get_text_output(result)
+    assert "line 19999" in output
+    assert "line 00000" not in output
+    full_output_path = result.details["full_output_path"]
+    assert Path(full_output_path).read_bytes() == b"".join(lines)
+    Path(full_output_path).unlink()
+
+
+@pytest.mark.asyncio
+async def test_bash_coalesces_streaming_updates(tmp_path: Path) -> None:
+    async def _exec(command: str, cwd: str, options: dict) -> dict:
+        for i in range(1000):
+            options["on_data"](f"{i}\n".encode())
+        return {"exit_code": 0}
+
+    updates = []
+    bash = create_bash_tool(str(tmp_path), BashToolOptions(operations=BashOperations(exec=_exec)))
+    await bash.execute("test-updates", {"command": "ignored"}, on_update=updates.append)
+
+    assert 0 < len(updates) < 1000
+    assert get_text_output(updates[-1]).endswith("999\n")
+
+
+@pytest.mark.asyncio
+async def test_bash_delivers_throttled_update_while_running(tmp_path: Path) -> None:
+    updates = []
+
+    async def _exec(command: str, cwd: str, options: dict) -> dict:
+        options["on_data"](b"step1\n")
+        options["on_data"](b"step2\n")
+        await asyncio.sleep(0.3)
+        assert get_text_output(updates[-1]) == "step1\nstep2\n"
+        return {"exit_code": 0}
+
+    bash = create_bash_tool(str(tmp_path), BashToolOptions(operations=BashOperations(exec=_exec)))
+    await bash.execute("test-trailing-update", {"command": "ignored"}, on_update=updates.append)
+
+    assert len(updates) == 2
+
+
+@pytest.mark.asyncio
+async def test_bash_raises_on_update_error_from_throttled_update(tmp_path: Path) -> None:
+    updates = []
+
+    def on_update(result) -> None:
+        updates.append(result)
+        if len(updates) == 2:
+            raise ValueError("update failed")
+
+    async def _exec(command: str, cwd: str, options: dict) -> dict:
+        options["on_data"](b"step1\n")
+        options["on_data"](b"step2\n")
+        await asyncio.sleep(0.3)
+        options["on_data"](b"step3\n")
+        return {"exit_code": 0}
+
+    bash = create_bash_tool(str(tmp_path), BashToolOptions(operations=BashOperations(exec=_exec)))
+    with pytest.raises(ValueError, match="update failed"):
+        await bash.execute("test-update-error", {"command": "ignored"}, on_update=on_update)
+    assert len(updates) == 2
+
+
+@pytest.mark.asyncio
+async def test_bash_abort_error_wins_over_on_update_error(tmp_path: Path) -> None:
+    updates = []
+
+    def on_update(result) -> None:
+        updates.append(result)
+        if len(updates) == 2:
+            raise ValueError("update failed")
+
+    async def _exec(command: str, cwd: str, options: dict) -> dict:
+        options["on_data"](b"step1\n")
+        options["on_data"](b"step2\n")
+        raise RuntimeError("aborted")
+
+    bash = create_bash_tool(str(tmp_path), BashToolOptions(operations=BashOperations(exec=_exec)))
+    with pytest.raises(RuntimeError, match="Command aborted"):
+        await bash.execute("test-update-error-abort", {"command": "ignored"}, on_update=on_update)